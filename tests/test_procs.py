@@ -0,0 +1,174 @@
+import math
+from dataclasses import asdict, replace
+
+import pytest
+
+from unified_gui import (
+    Proc,
+    ProcSource,
+    Item,
+    WarriorStats,
+    add_item,
+    build_stats,
+    apply_damage_range,
+    calculate_dps,
+    get_items,
+    init_db,
+    parse_procs,
+    proc_expectation_table,
+    proc_uptime,
+)
+
+
+@pytest.fixture
+def item_db(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    init_db()
+
+
+def make_stats(**overrides) -> WarriorStats:
+    params = dict(
+        player_level=60,
+        weapon_skill=305,
+        base_damage_mh=150,
+        base_speed_mh=2.7,
+        attack_power=1200,
+        hit=6,
+        spellbook_crit=25,
+        base_damage_oh=100,
+        base_speed_oh=1.8,
+        dual_wield_spec=5,
+        target_armor=3731,
+    )
+    params.update(overrides)
+    return WarriorStats(**params)
+
+
+def test_dps_without_procs_is_unchanged():
+    assert calculate_dps(make_stats()) == pytest.approx(96.15049595651644)
+
+
+def test_full_uptime_haste_doubles_white_dps():
+    stats = make_stats()
+    haste = Proc(effect="haste", chance=100, value=100, duration=1000)
+    hasted = replace(stats, procs=(ProcSource(item_name="Trinket", trigger="any", procs=(haste,)),))
+    assert calculate_dps(hasted) == pytest.approx(2 * calculate_dps(stats), rel=1e-6)
+
+
+def test_extra_attacks_add_main_hand_swings():
+    stats = make_stats(base_damage_oh=0.0, base_speed_oh=0.0, hit=9, weapon_skill=315)
+    proc = Proc(effect="extra_attack", chance=10, value=1)
+    with_procs = replace(stats, procs=(ProcSource(item_name="Sword", trigger="mh", procs=(proc,)),))
+    # 81% of swings land (14% parry, 5% dodge, no misses). Unhasted that is
+    # 0.81 / 2.7 = 0.3 landed hits/s, i.e. 0.03 extra attacks/s. Letting those
+    # land once more gives 0.81 * (1 / 2.7 + 0.03) * 0.1 = 0.03243 extra
+    # attacks/s, or 0.087561 extra swings per 2.7 s swing.
+    assert calculate_dps(with_procs) == pytest.approx(calculate_dps(stats) * 1.087561)
+
+
+def test_armor_reduction_lowers_target_armor():
+    stats = make_stats()
+    proc = Proc(effect="armor_reduction", chance=100, value=1000, duration=1000)
+    with_procs = replace(stats, procs=(ProcSource(item_name="Mace", trigger="any", procs=(proc,)),))
+    assert calculate_dps(with_procs) == pytest.approx(calculate_dps(replace(stats, target_armor=2731)))
+
+
+def test_internal_cooldown_limits_proc_rate():
+    proc = Proc(effect="extra_attack", chance=50, value=2, internal_cooldown=10)
+    # One attempt per second, then a 10 s lockout: one proc every 11 s.
+    expectation = proc_expectation_table((proc,), 2.0)
+    assert expectation.procs_per_second == pytest.approx(1 / 11)
+    assert expectation.extra_attacks == pytest.approx(2 / 11)
+
+
+def test_proc_uptime_without_internal_cooldown():
+    rate, duration = 0.4, 10.0
+    assert proc_uptime(rate, duration, 0.0) == pytest.approx(1 - math.exp(-rate * duration))
+
+
+def test_proc_uptime_limited_by_internal_cooldown():
+    rate, duration, cooldown = 0.4, 10.0, 30.0
+    assert proc_uptime(rate, duration, cooldown) == pytest.approx(duration / (cooldown + 1 / rate))
+
+
+def test_parse_procs_round_trip():
+    procs = (
+        Proc(effect="haste", chance=5, value=30, duration=10, internal_cooldown=20),
+        Proc(effect="armor_reduction", chance=10, value=200, duration=30),
+    )
+    assert parse_procs(asdict(proc) for proc in procs) == procs
+
+
+@pytest.mark.parametrize(
+    "entry",
+    [
+        {"effect": "lifesteal", "chance": 5, "value": 1},
+        {"effect": "haste", "value": 30},
+        {"effect": "haste", "chance": 5},
+        {"effect": "haste", "chance": 0, "value": 30},
+        {"effect": "haste", "chance": 150, "value": 30},
+        {"effect": "haste", "chance": 5, "value": -30},
+        {"effect": "haste", "chance": 5, "value": 30, "duration": -1},
+        {"effect": "haste", "chance": 5, "value": 30, "internal_cooldown": -1},
+    ],
+)
+def test_parse_procs_rejects_invalid_entries(entry):
+    with pytest.raises(ValueError):
+        parse_procs([entry])
+
+
+def test_item_procs_survive_database(tmp_path):
+    db_path = str(tmp_path / "items.db")
+    init_db(db_path)
+    procs = (Proc(effect="extra_attack", chance=5, value=1),)
+    add_item(Item(name="Axe", type="Main Hand", required_level=60, stats={"base_speed_mh": 2.7}, procs=procs), db_path)
+    (item,) = get_items(["Axe"], db_path)
+    assert item.procs == procs
+    assert item.stats == {"base_speed_mh": 2.7}
+
+
+def test_damage_range_replaces_flat_damage():
+    stats = apply_damage_range({"base_damage_mh": 999, "min_damage_mh": 100, "max_damage_mh": 200})
+    assert stats == {"base_damage_mh": 150}
+
+
+def test_half_specified_range_is_rejected():
+    with pytest.raises(ValueError):
+        apply_damage_range({"max_damage_oh": 120})
+
+
+def test_build_stats_applies_damage_ranges(item_db):
+    add_item(
+        Item(
+            name="Axe",
+            type="Main Hand",
+            required_level=60,
+            stats={"base_damage_mh": 999, "min_damage_mh": 100, "max_damage_mh": 200, "base_speed_mh": 2.7},
+        )
+    )
+    add_item(Item(name="Dagger", type="Off Hand", required_level=60, stats={"base_damage_oh": 60, "base_speed_oh": 1.8}))
+    stats = build_stats({"items": ["Axe", "Dagger"]})
+    assert stats.base_damage_mh == 150
+    assert stats.base_damage_oh == 60
+
+
+def test_build_stats_maps_proc_triggers(item_db):
+    haste = (Proc(effect="haste", chance=100, value=50, duration=1000),)
+    add_item(Item(name="Axe", type="Main Hand", required_level=60, stats={"base_speed_mh": 2.7}, procs=haste))
+    add_item(Item(name="Dagger", type="Off Hand", required_level=60, stats={"base_speed_oh": 1.8}, procs=haste))
+    add_item(Item(name="Shield", type="Off Hand", required_level=60, stats={"block_value": 50}, procs=haste))
+    add_item(Item(name="Ring", type="Ring", required_level=60, stats={}, procs=haste))
+    add_item(Item(name="Bow", type="Ranged", required_level=60, stats={}, procs=haste))
+    stats = build_stats({"items": ["Axe", "Dagger", "Shield", "Ring", "Bow"]})
+    triggers = {source.item_name: source.trigger for source in stats.procs}
+    assert triggers == {"Axe": "mh", "Dagger": "oh", "Shield": "any", "Ring": "any"}
+
+
+def test_shield_procs_affect_dps(item_db):
+    haste = (Proc(effect="haste", chance=100, value=50, duration=1000),)
+    add_item(Item(name="Axe", type="Main Hand", required_level=60, stats={"base_damage_mh": 150, "base_speed_mh": 2.7}))
+    add_item(Item(name="Shield", type="Off Hand", required_level=60, stats={"block_value": 50}, procs=haste))
+    add_item(Item(name="Bow", type="Ranged", required_level=60, stats={}, procs=haste))
+    base = calculate_dps(build_stats({"items": ["Axe"]}))
+    assert calculate_dps(build_stats({"items": ["Axe", "Bow"]})) == pytest.approx(base)
+    assert calculate_dps(build_stats({"items": ["Axe", "Shield"]})) == pytest.approx(1.5 * base, rel=1e-6)
@@ -9,11 +9,13 @@ entry point.
 from __future__ import annotations
 
 import json
+import math
 import sqlite3
 import tkinter as tk
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass, replace
+from functools import lru_cache
 from tkinter import messagebox, ttk
-from typing import Dict, Iterable, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
 
 # ---------------------------------------------------------------------------
@@ -21,6 +23,24 @@ from typing import Dict, Iterable, List, Optional
 
 DB_PATH = "items.db"
 
+PROC_EFFECTS = ("extra_attack", "haste", "armor_reduction")
+
+
+@dataclass(frozen=True)
+class Proc:
+    """On-hit effect triggered by an item.
+
+    ``chance`` is the percentage chance per landed hit. ``value`` is the number
+    of extra attacks, the haste percentage or the armor removed depending on
+    ``effect``. ``duration`` and ``internal_cooldown`` are given in seconds.
+    """
+
+    effect: str
+    chance: float
+    value: float
+    duration: float = 0.0
+    internal_cooldown: float = 0.0
+
 
 @dataclass
 class Item:
@@ -30,6 +50,20 @@ class Item:
     type: str
     required_level: int
     stats: Dict[str, float]
+    procs: Tuple[Proc, ...] = ()
+
+
+@dataclass(frozen=True)
+class ProcSource:
+    """Procs contributed by an equipped item and the hand that triggers them.
+
+    ``trigger`` is ``"mh"`` or ``"oh"`` for weapon procs and ``"any"`` for
+    procs that fire from either hand (trinkets, armor, ...).
+    """
+
+    item_name: str
+    trigger: str
+    procs: Tuple[Proc, ...]
 
 
 @dataclass
@@ -55,6 +89,7 @@ class WarriorStats:
     rage: float = 0.0
     imp_cleave: int = 0
     imp_execute_rage: float = 0.0
+    procs: Tuple[ProcSource, ...] = ()
 
 
 def init_db(db_path: str = DB_PATH) -> None:
@@ -79,11 +114,14 @@ def init_db(db_path: str = DB_PATH) -> None:
 def add_item(item: Item, db_path: str = DB_PATH) -> None:
     """Insert or update an item in the database."""
 
+    stats = dict(item.stats)
+    if item.procs:
+        stats["procs"] = [asdict(proc) for proc in item.procs]
     conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
     cursor.execute(
         "INSERT OR REPLACE INTO items (name, type, required_level, stats) VALUES (?, ?, ?, ?)",
-        (item.name, item.type, item.required_level, json.dumps(item.stats)),
+        (item.name, item.type, item.required_level, json.dumps(stats)),
     )
     conn.commit()
     conn.close()
@@ -120,10 +158,40 @@ def get_items(names: Iterable[str], db_path: str = DB_PATH) -> List[Item]:
     conn.close()
     items = []
     for name, type_, level, stats_json in rows:
-        items.append(Item(name=name, type=type_, required_level=level, stats=json.loads(stats_json)))
+        stats = json.loads(stats_json)
+        procs = parse_procs(stats.pop("procs", []))
+        items.append(Item(name=name, type=type_, required_level=level, stats=stats, procs=procs))
     return items
 
 
+def parse_procs(raw: Iterable[Dict[str, float]]) -> Tuple[Proc, ...]:
+    """Convert JSON proc definitions into :class:`Proc` instances."""
+
+    procs = []
+    for entry in raw:
+        if not isinstance(entry, dict):
+            raise ValueError("Each proc must be an object")
+        effect = entry.get("effect")
+        if effect not in PROC_EFFECTS:
+            raise ValueError(f"Unknown proc effect: {effect}")
+        for key in ("chance", "value"):
+            if key not in entry:
+                raise ValueError(f"Proc is missing '{key}'")
+        proc = Proc(
+            effect=effect,
+            chance=float(entry["chance"]),
+            value=float(entry["value"]),
+            duration=float(entry.get("duration", 0.0)),
+            internal_cooldown=float(entry.get("internal_cooldown", 0.0)),
+        )
+        if not 0 < proc.chance <= 100:
+            raise ValueError("Proc chance must be greater than 0 and at most 100")
+        if min(proc.value, proc.duration, proc.internal_cooldown) < 0:
+            raise ValueError("Proc value, duration and internal cooldown must not be negative")
+        procs.append(proc)
+    return tuple(procs)
+
+
 def attack_table(stats: WarriorStats, *, dual_wield: bool = False) -> Dict[str, float]:
     target_defense = stats.target_level * 5
     skill_diff = target_defense - stats.weapon_skill
@@ -192,7 +260,22 @@ def white_damage(base_damage: float, speed: float, stats: WarriorStats) -> float
     return base_damage + stats.attack_power / 14 * speed
 
 
-def expected_damage(base_damage: float, speed: float, table: Dict[str, float], stats: WarriorStats) -> float:
+def expected_damage(
+    base_damage: float,
+    speed: float,
+    table: Dict[str, float],
+    stats: WarriorStats,
+    *,
+    swing_interval: Optional[float] = None,
+) -> float:
+    """Return the white DPS of one hand.
+
+    ``speed`` is the weapon speed used for the attack power bonus of each
+    swing. ``swing_interval`` is the time between swings and defaults to
+    ``speed``; haste shortens the interval without changing per-swing damage.
+    """
+
+    swing_interval = speed if swing_interval is None else swing_interval
     damage = white_damage(base_damage, speed, stats)
     skill_gap = stats.target_level * 5 - stats.weapon_skill
 
@@ -212,16 +295,116 @@ def expected_damage(base_damage: float, speed: float, table: Dict[str, float], s
         + table["glancing"] * glancing_avg
     ) / 100
     mitigation = armor_mitigation(stats.target_armor, stats.player_level)
-    return avg / speed * (1 - mitigation)
+    return avg / swing_interval * (1 - mitigation)
+
+
+def proc_uptime(trigger_rate: float, duration: float, internal_cooldown: float) -> float:
+    """Return the fraction of time a refreshing proc buff is active.
+
+    Procs are treated as a Poisson process with ``trigger_rate`` attempts per
+    second that is paused for ``internal_cooldown`` seconds after each proc.
+    """
+
+    if trigger_rate <= 0 or duration <= 0:
+        return 0.0
+    cycle = internal_cooldown + 1 / trigger_rate
+    if duration <= internal_cooldown:
+        active = duration
+    else:
+        active = internal_cooldown + (1 - math.exp(-trigger_rate * (duration - internal_cooldown))) / trigger_rate
+    return min(active / cycle, 1.0)
+
+
+@dataclass(frozen=True)
+class ProcExpectation:
+    """Expected proc contribution per second of combat."""
+
+    procs_per_second: float = 0.0
+    extra_attacks: float = 0.0
+    haste: float = 0.0
+    armor_reduction: float = 0.0
+
+    def __add__(self, other: ProcExpectation) -> ProcExpectation:
+        return ProcExpectation(
+            procs_per_second=self.procs_per_second + other.procs_per_second,
+            extra_attacks=self.extra_attacks + other.extra_attacks,
+            haste=self.haste + other.haste,
+            armor_reduction=self.armor_reduction + other.armor_reduction,
+        )
+
+
+@lru_cache(maxsize=256)
+def proc_expectation_table(procs: Tuple[Proc, ...], hits_per_second: float) -> ProcExpectation:
+    """Return the expected contribution of an item's procs.
+
+    The result is memoised on the exact proc list and landed hit rate, so
+    re-evaluating an unchanged build reuses it while any change to hit, skill
+    or speed computes a new entry. The cache is bounded to keep long sessions
+    from growing it indefinitely.
+    """
+
+    expectation = ProcExpectation()
+    for proc in procs:
+        trigger_rate = max(proc.chance, 0.0) / 100 * hits_per_second
+        if trigger_rate <= 0:
+            continue
+        proc_rate = trigger_rate / (1 + trigger_rate * proc.internal_cooldown)
+        uptime = proc_uptime(trigger_rate, proc.duration, proc.internal_cooldown)
+        expectation += ProcExpectation(
+            procs_per_second=proc_rate,
+            extra_attacks=proc_rate * proc.value if proc.effect == "extra_attack" else 0.0,
+            haste=proc.value * uptime if proc.effect == "haste" else 0.0,
+            armor_reduction=proc.value * uptime if proc.effect == "armor_reduction" else 0.0,
+        )
+    return expectation
+
+
+def proc_expectations(stats: WarriorStats, table: Dict[str, float], *, dual_wield: bool) -> ProcExpectation:
+    """Sum the proc expectations of every equipped item.
+
+    The swing rate depends on the haste and extra attacks the procs provide, so
+    the unhasted estimate is refined with a single fixed-point step. That step
+    lets extra attacks trigger procs, so one level of extra attacks granted by
+    extra attacks is counted; deeper chains are not.
+    """
+
+    land_chance = (table["hit"] + table["crit"] + table["block"] + table["glancing"]) / 100
+    swings_mh = 1 / stats.base_speed_mh if stats.base_speed_mh > 0 else 0.0
+    swings_oh = 1 / stats.base_speed_oh if dual_wield else 0.0
+
+    def evaluate(haste: float, extra_attacks: float) -> ProcExpectation:
+        haste_multiplier = 1 + haste / 100
+        hits_mh = land_chance * (swings_mh * haste_multiplier + extra_attacks)
+        hits_oh = land_chance * swings_oh * haste_multiplier
+        hits_per_trigger = {"mh": hits_mh, "oh": hits_oh, "any": hits_mh + hits_oh}
+        total = ProcExpectation()
+        for source in stats.procs:
+            total += proc_expectation_table(source.procs, hits_per_trigger[source.trigger])
+        return total
+
+    estimate = evaluate(0.0, 0.0)
+    return evaluate(estimate.haste, estimate.extra_attacks)
 
 
 def calculate_dps(stats: WarriorStats) -> float:
     is_dual_wield = stats.base_damage_oh > 0 and stats.base_speed_oh > 0
     table = attack_table(stats, dual_wield=is_dual_wield)
-    dps_mh = expected_damage(stats.base_damage_mh, stats.base_speed_mh, table, stats)
-    dps_total = dps_mh
+    haste_multiplier = 1.0
+    extra_attacks = 0.0
+    if stats.procs:
+        procs = proc_expectations(stats, table, dual_wield=is_dual_wield)
+        haste_multiplier += procs.haste / 100
+        extra_attacks = procs.extra_attacks
+        if procs.armor_reduction:
+            stats = replace(stats, target_armor=max(stats.target_armor - procs.armor_reduction, 0))
+
+    swing_mh = stats.base_speed_mh / haste_multiplier
+    dps_mh = expected_damage(stats.base_damage_mh, stats.base_speed_mh, table, stats, swing_interval=swing_mh)
+    # Extra attacks are main hand swings on top of the regular swing timer.
+    dps_total = dps_mh * (1 + extra_attacks * swing_mh)
     if is_dual_wield:
-        dps_oh = expected_damage(stats.base_damage_oh, stats.base_speed_oh, table, stats)
+        swing_oh = stats.base_speed_oh / haste_multiplier
+        dps_oh = expected_damage(stats.base_damage_oh, stats.base_speed_oh, table, stats, swing_interval=swing_oh)
         dual_wield_modifier = 0.5 + 0.025 * stats.dual_wield_spec
         dps_total += dps_oh * dual_wield_modifier
     return dps_total
@@ -262,6 +445,9 @@ def yellow_attack_damage(
 
 IGNORED_ITEM_STATS = {"dual_wield_spec", "impale"}
 
+# Procs on these items never trigger from melee swings.
+NON_MELEE_ITEM_TYPES = {"Ranged", "Ammo"}
+
 STAT_KEYS: List[str] = [
     "attack_power",
     "hit",
@@ -273,6 +459,10 @@ STAT_KEYS: List[str] = [
     "base_speed_mh",
     "base_damage_oh",
     "base_speed_oh",
+    "min_damage_mh",
+    "max_damage_mh",
+    "min_damage_oh",
+    "max_damage_oh",
     "block_value",
     "rage",
     "imp_cleave",
@@ -297,6 +487,28 @@ ITEM_TYPES: List[str] = [
 ]
 
 
+def validate_damage_range(item_stats: Dict[str, float]) -> None:
+    """Raise ``ValueError`` if a weapon damage range has only one bound."""
+
+    for hand in ("mh", "oh"):
+        if (f"min_damage_{hand}" in item_stats) != (f"max_damage_{hand}" in item_stats):
+            raise ValueError(f"Both min_damage_{hand} and max_damage_{hand} are required")
+
+
+def apply_damage_range(item_stats: Dict[str, float]) -> Dict[str, float]:
+    """Replace an item's flat weapon damage with the average of its range."""
+
+    validate_damage_range(item_stats)
+    result = dict(item_stats)
+    for hand in ("mh", "oh"):
+        if f"min_damage_{hand}" not in result:
+            continue
+        low = result.pop(f"min_damage_{hand}")
+        high = result.pop(f"max_damage_{hand}")
+        result[f"base_damage_{hand}"] = (low + high) / 2
+    return result
+
+
 def merge_stats(base: Dict[str, float], item_stats: Dict[str, float]) -> None:
     for key, value in item_stats.items():
         if key in IGNORED_ITEM_STATS:
@@ -331,8 +543,16 @@ def build_stats(params: Dict[str, float]) -> WarriorStats:
         "imp_execute_rage": params.get("imp_execute_rage", 0.0),
     }
 
+    proc_sources = []
     for item in items:
-        merge_stats(stats_dict, item.stats)
+        item_stats = apply_damage_range(item.stats)
+        merge_stats(stats_dict, item_stats)
+        if item.procs and item.type not in NON_MELEE_ITEM_TYPES:
+            trigger = {"Main Hand": "mh", "Off Hand": "oh"}.get(item.type, "any")
+            # Shields and other non-weapon off hands proc from any melee hit.
+            if trigger == "oh" and not ({"base_damage_oh", "base_speed_oh"} & item_stats.keys()):
+                trigger = "any"
+            proc_sources.append(ProcSource(item_name=item.name, trigger=trigger, procs=item.procs))
 
     strength = stats_dict.pop("str", 0) + stats_dict.pop("strength", 0)
     agility = stats_dict.pop("agi", 0) + stats_dict.pop("agility", 0)
@@ -347,7 +567,7 @@ def build_stats(params: Dict[str, float]) -> WarriorStats:
     stats_dict["imp_cleave"] = int(stats_dict.get("imp_cleave", 0))
     stats_dict["imp_execute_rage"] = float(stats_dict.get("imp_execute_rage", 0.0))
 
-    return WarriorStats(**stats_dict)
+    return WarriorStats(**stats_dict, procs=tuple(proc_sources))
 
 
 class UnifiedApp:
@@ -587,21 +807,27 @@ class UnifiedApp:
                 column=1, row=start_row + offset, sticky=(tk.W, tk.E), pady=2
             )
 
+        procs_row = start_row + len(STAT_KEYS)
+        procs_var = tk.StringVar()
+        ttk.Label(frame, text="procs (JSON)").grid(column=0, row=procs_row, sticky=tk.W, pady=2)
+        ttk.Entry(frame, textvariable=procs_var, width=40).grid(column=1, row=procs_row, sticky=(tk.W, tk.E), pady=2)
+
         init_button = ttk.Button(frame, text="Initialize DB", command=self._init_db_clicked)
-        init_button.grid(column=0, row=start_row + len(STAT_KEYS), pady=(6, 0), sticky=tk.W)
+        init_button.grid(column=0, row=procs_row + 1, pady=(6, 0), sticky=tk.W)
 
         add_button = ttk.Button(
             frame,
             text="Add Item",
             command=lambda: self._add_item_clicked(name_var, type_var, level_var),
         )
-        add_button.grid(column=1, row=start_row + len(STAT_KEYS), pady=(6, 0), sticky=tk.E)
+        add_button.grid(column=1, row=procs_row + 1, pady=(6, 0), sticky=tk.E)
 
         frame.columnconfigure(1, weight=1)
 
         self.manager_name_var = name_var
         self.manager_type_var = type_var
         self.manager_level_var = level_var
+        self.manager_procs_var = procs_var
 
     def _init_db_clicked(self) -> None:
         init_db()
@@ -614,6 +840,13 @@ class UnifiedApp:
         type_var: tk.StringVar,
         level_var: tk.StringVar,
     ) -> None:
+        try:
+            raw_procs = self.manager_procs_var.get().strip()
+            procs = parse_procs(json.loads(raw_procs)) if raw_procs else ()
+        except (ValueError, TypeError) as exc:
+            messagebox.showerror("Error", f"Invalid procs: {exc}")
+            return
+
         try:
             name = name_var.get().strip()
             type_ = type_var.get().strip()
@@ -625,7 +858,12 @@ class UnifiedApp:
                 raw = var.get().strip()
                 if raw:
                     stats[key] = float(raw)
-            add_item(Item(name=name, type=type_, required_level=level, stats=stats))
+            try:
+                validate_damage_range(stats)
+            except ValueError as exc:
+                messagebox.showerror("Error", str(exc))
+                return
+            add_item(Item(name=name, type=type_, required_level=level, stats=stats, procs=procs))
         except ValueError:
             messagebox.showerror("Error", "Level and stats must be numeric")
             return
@@ -639,6 +877,7 @@ class UnifiedApp:
         level_var.set("0")
         for var in self.manager_stat_vars.values():
             var.set("")
+        self.manager_procs_var.set("")
         self.refresh_items()
 
     # ------------------------------------------------------------------